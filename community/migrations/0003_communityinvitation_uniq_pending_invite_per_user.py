@@ -0,0 +1,23 @@
+# Generated by Django 4.2.27 on 2026-10-16 09:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0002_communityinvitation_communityjoinrequest_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='communityinvitation',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='communityinvitation',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'pending')), fields=('community', 'invitee'), name='uniq_pending_invite_per_user'),
+        ),
+    ]
@@ -159,12 +159,19 @@ class CommunityInvitation(models.Model):
     responded_at = models.DateTimeField(null=True, blank=True)
     
     class Meta:
-        unique_together = ('community', 'invitee')
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['invitee', 'status', '-created_at']),
             models.Index(fields=['community', 'status']),
         ]
+        constraints = [
+            # Only one pending invitation per user; answered ones don't block re-inviting
+            models.UniqueConstraint(
+                fields=['community', 'invitee'],
+                condition=models.Q(status='pending'),
+                name='uniq_pending_invite_per_user',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.inviter.username} invited {self.invitee.username} to {self.community.name}"
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import *
+from .utils import is_community_member
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -30,11 +31,11 @@ class CommunitySerializer(serializers.ModelSerializer):
     def get_is_member(self, obj):
         request = self.context.get('request')
         if request and request.user.is_authenticated:
-            return CommunityMember.objects.filter(
-                user=request.user, 
-                community=obj, 
-                is_approved=True
-            ).exists()
+            # The list queryset already annotates membership
+            is_member = getattr(obj, 'user_is_member', None)
+            if is_member is not None:
+                return is_member
+            return is_community_member(request.user.id, obj.id)
         return False
     
     def get_user_role(self, obj):
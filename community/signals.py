@@ -0,0 +1,21 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import CommunityMember
+from .utils import cache_member_added, cache_member_removed
+
+
+@receiver(post_save, sender=CommunityMember)
+def sync_membership_cache_on_save(sender, instance, **kwargs):
+    community_id, user_id = instance.community_id, instance.user_id
+    if instance.is_approved:
+        transaction.on_commit(lambda: cache_member_added(community_id, user_id))
+    else:
+        transaction.on_commit(lambda: cache_member_removed(community_id, user_id))
+
+
+@receiver(post_delete, sender=CommunityMember)
+def sync_membership_cache_on_delete(sender, instance, **kwargs):
+    community_id, user_id = instance.community_id, instance.user_id
+    transaction.on_commit(lambda: cache_member_removed(community_id, user_id))
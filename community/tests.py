@@ -1,3 +1,177 @@
+from unittest import mock, skipUnless
+
+import redis
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from . import utils
+from .models import Community, CommunityInvitation, CommunityMember
+from .views import InviteUserToCommunityView
+
+try:
+    import fakeredis
+except ImportError:
+    fakeredis = None
+
+User = get_user_model()
+
+
+class MembershipCacheTestMixin:
+    def setUp(self):
+        utils._redis_down_until = 0
+        self.addCleanup(setattr, utils, '_redis_down_until', 0)
+        utils._stale_community_ids.clear()
+        self.addCleanup(utils._stale_community_ids.clear)
+        self.owner = User.objects.create_user(username='owner', email='owner@example.com', password='pass1234')
+        self.user = User.objects.create_user(username='member', email='member@example.com', password='pass1234')
+        self.community = Community.objects.create(
+            name='testing', title='Testing', created_by=self.owner, visibility='public'
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            CommunityMember.objects.create(user=self.owner, community=self.community)
+
+    def join(self, user):
+        with self.captureOnCommitCallbacks(execute=True):
+            return CommunityMember.objects.create(user=user, community=self.community)
+
+
+@skipUnless(fakeredis, 'fakeredis is not installed')
+class MembershipCacheTests(MembershipCacheTestMixin, TestCase):
+    def setUp(self):
+        self.redis = fakeredis.FakeRedis()
+        patcher = mock.patch.object(utils, 'redis_client', self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # Warm synchronously so the test sees the filled set
+        patcher = mock.patch.object(utils, '_schedule_warm', side_effect=utils._warm_members_cache)
+        self.schedule_warm = patcher.start()
+        self.addCleanup(patcher.stop)
+        super().setUp()
+        self.key = utils.community_members_key(self.community.id)
+        self.redis.delete(self.key)
+
+    def test_cold_set_is_answered_from_database_and_filled(self):
+        self.assertTrue(utils.is_community_member(self.owner.id, self.community.id))
+        self.schedule_warm.assert_called_once_with(self.community.id)
+        self.assertEqual(self.redis.smembers(self.key), {b'*', str(self.owner.id).encode()})
+        self.assertGreater(self.redis.ttl(self.key), 0)
+
+        with self.assertNumQueries(0):
+            self.assertFalse(utils.is_community_member(self.user.id, self.community.id))
+
+    def test_save_and_delete_keep_set_in_sync(self):
+        utils._warm_members_cache(self.community.id)
+        member = self.join(self.user)
+        self.assertTrue(self.redis.sismember(self.key, self.user.id))
+        self.assertTrue(utils.is_community_member(self.user.id, self.community.id))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            member.delete()
+        self.assertFalse(self.redis.sismember(self.key, self.user.id))
+        self.assertFalse(utils.is_community_member(self.user.id, self.community.id))
+
+    def test_join_during_warm_up_is_not_lost(self):
+        load_member_ids = utils._approved_member_ids
+
+        def load_then_join(community_id):
+            member_ids = load_member_ids(community_id)
+            self.join(self.user)
+            return member_ids
+
+        with mock.patch.object(utils, '_approved_member_ids', side_effect=load_then_join):
+            utils._warm_members_cache(self.community.id)
+
+        self.assertTrue(utils.is_community_member(self.user.id, self.community.id))
+
+    def test_leave_during_warm_up_is_not_cached(self):
+        member = self.join(self.user)
+        self.redis.delete(self.key)
+        load_member_ids = utils._approved_member_ids
+
+        def load_then_leave(community_id):
+            member_ids = load_member_ids(community_id)
+            with self.captureOnCommitCallbacks(execute=True):
+                member.delete()
+            return member_ids
+
+        with mock.patch.object(utils, '_approved_member_ids', side_effect=load_then_leave):
+            utils._warm_members_cache(self.community.id)
+
+        self.assertFalse(utils.is_community_member(self.user.id, self.community.id))
+
+    def test_update_skipped_while_redis_is_down_invalidates_set(self):
+        member = self.join(self.user)
+        utils._warm_members_cache(self.community.id)
+        utils._mark_redis_down(redis.ConnectionError('down'))
+        with self.captureOnCommitCallbacks(execute=True):
+            member.delete()
+
+        utils._redis_down_until = 0
+        self.assertFalse(utils.is_community_member(self.user.id, self.community.id))
+
+    def test_failed_update_invalidates_set(self):
+        utils._warm_members_cache(self.community.id)
+        with mock.patch.object(self.redis, 'pipeline', side_effect=redis.ConnectionError('down')):
+            self.join(self.user)
+
+        utils._redis_down_until = 0
+        self.assertTrue(utils.is_community_member(self.user.id, self.community.id))
+
+
+class MembershipCacheFallbackTests(MembershipCacheTestMixin, TestCase):
+    def setUp(self):
+        unreachable = redis.Redis(host='127.0.0.1', port=1, socket_connect_timeout=0.1)
+        patcher = mock.patch.object(utils, 'redis_client', unreachable)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        super().setUp()
+
+    def test_falls_back_to_database_when_redis_is_down(self):
+        self.assertTrue(utils.is_community_member(self.owner.id, self.community.id))
+        self.assertFalse(utils.is_community_member(self.user.id, self.community.id))
+        self.join(self.user)
+        self.assertTrue(utils.is_community_member(self.user.id, self.community.id))
+
+    def test_skips_redis_after_a_failure(self):
+        utils.is_community_member(self.owner.id, self.community.id)
+        with mock.patch.object(utils.redis_client, 'pipeline') as pipeline:
+            utils.is_community_member(self.owner.id, self.community.id)
+            self.join(self.user)
+        pipeline.assert_not_called()
+
+
+class InviteUserToCommunityViewTests(TestCase):
+    def setUp(self):
+        # Never touch the developer's real membership cache
+        unreachable = redis.Redis(host='127.0.0.1', port=1, socket_connect_timeout=0.1)
+        patcher = mock.patch.object(utils, 'redis_client', unreachable)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        utils._redis_down_until = 0
+        self.addCleanup(setattr, utils, '_redis_down_until', 0)
+        self.addCleanup(utils._stale_community_ids.clear)
+        self.owner = User.objects.create_user(username='owner', email='owner@example.com', password='pass1234')
+        self.invitee = User.objects.create_user(username='invitee', email='invitee@example.com', password='pass1234')
+        self.community = Community.objects.create(
+            name='private', title='Private', created_by=self.owner, visibility='private'
+        )
+
+    def invite(self):
+        request = APIRequestFactory().post(
+            '/communities/invite/', {'community': 'private', 'user_id': self.invitee.id}, format='json'
+        )
+        force_authenticate(request, user=self.owner)
+        return InviteUserToCommunityView.as_view()(request)
+
+    def test_duplicate_pending_invitation_is_rejected(self):
+        self.assertEqual(self.invite().status_code, 201)
+        response = self.invite()
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['error'], "User already has a pending invitation")
+        self.assertEqual(CommunityInvitation.objects.filter(community=self.community).count(), 1)
 
-# Create your tests here.
+    def test_declined_invitation_does_not_block_reinvite(self):
+        self.assertEqual(self.invite().status_code, 201)
+        CommunityInvitation.objects.update(status='declined')
+        self.assertEqual(self.invite().status_code, 201)
@@ -0,0 +1,175 @@
+import logging
+import threading
+import time
+
+import redis
+from django.conf import settings
+from django.db import connection
+
+from .models import CommunityMember
+
+logger = logging.getLogger(__name__)
+
+redis_client = redis.Redis.from_url(settings.REDIS_URL, socket_timeout=0.5, socket_connect_timeout=0.5)
+
+# Membership sets expire so any drift from the database is bounded
+MEMBERSHIP_CACHE_TIMEOUT = 60 * 60
+# After a Redis failure, go straight to the database for this many seconds
+REDIS_RETRY_INTERVAL = 30
+# Marker stored in a set once it holds the full member list
+WARM_MARKER = '*'
+
+_redis_down_until = 0
+# Communities whose set missed an update; their keys are dropped once Redis is back
+_stale_community_ids = set()
+# Communities with a background warm-up in flight in this process
+_warming_community_ids = set()
+_warming_lock = threading.Lock()
+
+
+def community_members_key(community_id):
+    return f'community:{community_id}:members'
+
+
+def community_members_version_key(community_id):
+    return f'community:{community_id}:members:version'
+
+
+def _redis_available():
+    return time.monotonic() >= _redis_down_until
+
+
+def _mark_redis_down(e):
+    global _redis_down_until
+    if _redis_available():
+        logger.warning(f"Membership cache unavailable, using the database for {REDIS_RETRY_INTERVAL}s: {e}")
+    _redis_down_until = time.monotonic() + REDIS_RETRY_INTERVAL
+
+
+def _approved_member_ids(community_id):
+    return list(CommunityMember.objects.filter(
+        community_id=community_id, is_approved=True
+    ).values_list('user_id', flat=True))
+
+
+def _invalidate_stale_sets():
+    """
+    Drop the sets of communities that missed an update while Redis was
+    unreachable, so they are rebuilt from the database instead of serving
+    answers from before the change. Bumping the version also aborts any
+    warm-up that read the database before the change committed.
+    """
+    if not _stale_community_ids:
+        return
+    community_ids = list(_stale_community_ids)
+    with redis_client.pipeline() as pipe:
+        for community_id in community_ids:
+            version_key = community_members_version_key(community_id)
+            pipe.delete(community_members_key(community_id))
+            pipe.incr(version_key)
+            pipe.expire(version_key, MEMBERSHIP_CACHE_TIMEOUT)
+        pipe.execute()
+    _stale_community_ids.difference_update(community_ids)
+
+
+def _warm_members_cache(community_id):
+    """
+    Load the member list from the database and store it as a complete set.
+    Membership signals bump the version key, so a join or leave committed
+    while the list is being read aborts the write instead of caching a
+    stale list.
+    """
+    key = community_members_key(community_id)
+    with redis_client.pipeline() as pipe:
+        pipe.watch(community_members_version_key(community_id))
+        member_ids = _approved_member_ids(community_id)
+        pipe.multi()
+        pipe.delete(key)
+        pipe.sadd(key, WARM_MARKER, *member_ids)
+        pipe.expire(key, MEMBERSHIP_CACHE_TIMEOUT)
+        try:
+            pipe.execute()
+        except redis.WatchError:
+            logger.debug(f"Membership changed while warming community {community_id}; not cached")
+
+
+def _warm_in_background(community_id):
+    try:
+        if _redis_available():
+            _invalidate_stale_sets()
+            _warm_members_cache(community_id)
+    except redis.RedisError as e:
+        _mark_redis_down(e)
+    finally:
+        with _warming_lock:
+            _warming_community_ids.discard(community_id)
+        connection.close()
+
+
+def _schedule_warm(community_id):
+    """Fill a community's set off the request path, once per process"""
+    with _warming_lock:
+        if community_id in _warming_community_ids:
+            return
+        _warming_community_ids.add(community_id)
+    threading.Thread(target=_warm_in_background, args=(community_id,), daemon=True).start()
+
+
+def is_community_member(user_id, community_id):
+    """
+    Check approved membership using the Redis set community:{id}:members.
+    A set that isn't fully loaded is answered from the database and filled
+    in the background; while Redis is unavailable the check falls back to
+    the database.
+    """
+    if _redis_available():
+        key = community_members_key(community_id)
+        try:
+            _invalidate_stale_sets()
+            with redis_client.pipeline(transaction=False) as pipe:
+                pipe.sismember(key, user_id)
+                pipe.sismember(key, WARM_MARKER)
+                is_member, is_warm = pipe.execute()
+            if is_member:
+                return True
+            if is_warm:
+                return False
+            _schedule_warm(community_id)
+        except redis.RedisError as e:
+            _mark_redis_down(e)
+
+    return CommunityMember.objects.filter(
+        user_id=user_id, community_id=community_id, is_approved=True
+    ).exists()
+
+
+def _update_members_cache(community_id, user_id, added):
+    if not _redis_available():
+        _stale_community_ids.add(community_id)
+        return
+    key = community_members_key(community_id)
+    version_key = community_members_version_key(community_id)
+    try:
+        _invalidate_stale_sets()
+        with redis_client.pipeline() as pipe:
+            if added:
+                pipe.sadd(key, user_id)
+            else:
+                pipe.srem(key, user_id)
+            pipe.expire(key, MEMBERSHIP_CACHE_TIMEOUT)
+            pipe.incr(version_key)
+            pipe.expire(version_key, MEMBERSHIP_CACHE_TIMEOUT)
+            pipe.execute()
+    except redis.RedisError as e:
+        _stale_community_ids.add(community_id)
+        _mark_redis_down(e)
+
+
+def cache_member_added(community_id, user_id):
+    """Add a user to the membership set"""
+    _update_members_cache(community_id, user_id, added=True)
+
+
+def cache_member_removed(community_id, user_id):
+    """Remove a user from the membership set"""
+    _update_members_cache(community_id, user_id, added=False)
@@ -4,11 +4,13 @@ from rest_framework.decorators import action
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.views import APIView
 from django.db.models import Q, Count, Exists, OuterRef
+from django.db import IntegrityError, transaction
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from datetime import timedelta
 from .models import *
 from .serializers import *
+from .utils import is_community_member
 from post.models import Notification
 
 User = get_user_model()
@@ -423,7 +425,7 @@ class CommunityViewSet(viewsets.ModelViewSet):
         
         old_role = member.role
         member.role = new_role
-        member.save()
+        member.save(update_fields=['role'])
         
         # Notify the member
         Notification.objects.create(
@@ -567,7 +569,7 @@ class CommunityJoinRequestViewSet(viewsets.ModelViewSet):
         join_request.status = 'approved'
         join_request.reviewed_by = request.user
         join_request.reviewed_at = timezone.now()
-        join_request.save()
+        join_request.save(update_fields=['status', 'reviewed_by', 'reviewed_at'])
         
         # Notify user
         Notification.objects.create(
@@ -596,7 +598,7 @@ class CommunityJoinRequestViewSet(viewsets.ModelViewSet):
         join_request.status = 'rejected'
         join_request.reviewed_by = request.user
         join_request.reviewed_at = timezone.now()
-        join_request.save()
+        join_request.save(update_fields=['status', 'reviewed_by', 'reviewed_at'])
         
         return Response({
             "success": True,
@@ -722,7 +724,7 @@ class CommunityInvitationViewSet(viewsets.ModelViewSet):
         # Update invitation status
         invitation.status = 'accepted'
         invitation.responded_at = timezone.now()
-        invitation.save()
+        invitation.save(update_fields=['status', 'responded_at'])
         
         return Response({
             "success": True,
@@ -748,7 +750,7 @@ class CommunityInvitationViewSet(viewsets.ModelViewSet):
         # Update invitation status
         invitation.status = 'declined'
         invitation.responded_at = timezone.now()
-        invitation.save()
+        invitation.save(update_fields=['status', 'responded_at'])
         
         return Response({
             "success": True,
@@ -806,33 +808,36 @@ class InviteUserToCommunityView(APIView):
             }, status=status.HTTP_404_NOT_FOUND)
         
         # Check if user is already a member
-        if CommunityMember.objects.filter(user=invitee, community=community, is_approved=True).exists():
+        if is_community_member(invitee.id, community.id):
             return Response({
                 "success": False,
                 "error": "User is already a member of this community"
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Check if invitation already exists
-        existing_invitation = CommunityInvitation.objects.filter(
-            community=community,
-            invitee=invitee,
-            status='pending'
-        ).first()
-        
-        if existing_invitation:
+        # Create invitation (uniq_pending_invite_per_user rejects duplicate pending invites)
+        try:
+            # Savepoint so a rejected insert doesn't break an enclosing transaction
+            with transaction.atomic():
+                invitation = CommunityInvitation.objects.create(
+                    community=community,
+                    inviter=request.user,
+                    invitee=invitee,
+                    message=message
+                )
+        except IntegrityError as e:
+            # SQLite doesn't name partial indexes in the error, so confirm against the table
+            is_duplicate = 'uniq_pending_invite_per_user' in str(e) or CommunityInvitation.objects.filter(
+                community=community,
+                invitee=invitee,
+                status='pending'
+            ).exists()
+            if not is_duplicate:
+                raise
             return Response({
                 "success": False,
                 "error": "User already has a pending invitation"
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Create invitation
-        invitation = CommunityInvitation.objects.create(
-            community=community,
-            inviter=request.user,
-            invitee=invitee,
-            message=message
-        )
-        
         # Create notification
         Notification.objects.create(
             recipient=invitee,
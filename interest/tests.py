@@ -1,3 +1,78 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.test import TestCase
+from rest_framework.test import APIRequestFactory
+
+from .models import Category, SubCategory
+from .views import CategoryViewSet
+
+
+@skipUnless(connection.vendor == 'postgresql', 'JSONBAgg retrieve path only runs on PostgreSQL')
+class CategoryRetrieveTests(TestCase):
+    def setUp(self):
+        self.category = Category.objects.create(name='Sports')
+        self.second = SubCategory.objects.create(category=self.category, name='Tennis')
+        self.first = SubCategory.objects.create(category=self.category, name='Football')
+
+    def test_retrieve_returns_nested_subcategories(self):
+        response = self.client.get(f'/api/categories/{self.category.pk}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data'], {
+            'id': self.category.pk,
+            'name': 'Sports',
+            'subcategories': [
+                {'id': self.second.pk, 'name': 'Tennis'},
+                {'id': self.first.pk, 'name': 'Football'},
+            ],
+        })
+
+    def test_retrieve_without_subcategories_returns_empty_list(self):
+        empty = Category.objects.create(name='Music')
+        response = self.client.get(f'/api/categories/{empty.pk}/')
+        self.assertEqual(response.json()['data']['subcategories'], [])
+
+    def test_retrieve_invalid_pk_returns_404(self):
+        self.assertEqual(self.client.get('/api/categories/abc/').status_code, 404)
+        self.assertEqual(self.client.get('/api/categories/999999/').status_code, 404)
+
+
+class CategoryWriteTests(TestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.category = Category.objects.create(name='Sports')
+        SubCategory.objects.create(category=self.category, name='Tennis')
+
+    def test_write_responses_share_one_shape(self):
+        request = self.factory.post('/api/categories/', {'name': 'Music'}, format='json')
+        response = CategoryViewSet.as_view({'post': 'create'})(request)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(set(response.data['data']), {'id', 'name'})
+
+        for method, action in (('put', 'update'), ('patch', 'partial_update')):
+            request = getattr(self.factory, method)(
+                f'/api/categories/{self.category.pk}/', {'name': 'Games'}, format='json'
+            )
+            response = CategoryViewSet.as_view({method: action})(request, pk=self.category.pk)
+            self.assertEqual(response.data['data'], {'id': self.category.pk, 'name': 'Games'})
+
+
+class CategoryRetrieveFallbackTests(TestCase):
+    def setUp(self):
+        self.category = Category.objects.create(name='Sports')
+        self.first = SubCategory.objects.create(category=self.category, name='Tennis')
+        self.second = SubCategory.objects.create(category=self.category, name='Football')
 
-# Create your tests here.
+    @skipUnless(connection.vendor != 'postgresql', 'PostgreSQL uses the JSONBAgg retrieve path')
+    def test_retrieve_orders_subcategories_by_id(self):
+        request = APIRequestFactory().get(f'/api/categories/{self.category.pk}/')
+        with CaptureQueriesContext(connection) as queries:
+            response = CategoryViewSet.as_view({'get': 'retrieve'})(request, pk=self.category.pk)
+        self.assertEqual(response.data['data']['subcategories'], [
+            {'id': self.first.pk, 'name': 'Tennis'},
+            {'id': self.second.pk, 'name': 'Football'},
+        ])
+        subcategory_query = queries.captured_queries[-1]['sql']
+        self.assertIn('interest_subcategory', subcategory_query)
+        self.assertIn('ORDER BY "interest_subcategory"."id"', subcategory_query)
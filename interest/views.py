@@ -1,5 +1,10 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.response import Response
+from rest_framework.pagination import PageNumberPagination
+from django.db import connection
+from django.db.models import Prefetch, Q
+from django.db.models.functions import JSONObject
+from django.http import Http404
 from .models import *
 from .serializers import *
 
@@ -18,21 +23,56 @@ def error_response(message, code=status.HTTP_400_BAD_REQUEST):
     }, status=code)
 """ End of Custom Responses """
 
+class CategoryPagination(PageNumberPagination):
+    """ Page size for category/sub-category listings """
+    page_size = 50
+
 """ Viewset for Interest """
 class CategoryViewSet(viewsets.ModelViewSet):
     """ Viewset for Category """
-    queryset = Category.objects.all()
+    # Nested sub-categories in id order, matching the PostgreSQL retrieve path
+    queryset = Category.objects.prefetch_related(
+        Prefetch('subcategories', queryset=SubCategory.objects.order_by('id'))
+    ).order_by('id')
     serializer_class = CategorySerializer
     permission_classes = [permissions.AllowAny]
+    pagination_class = CategoryPagination
 
     # List all
     def list(self, request, *args, **kwargs):
-        categories = self.get_queryset()
+        categories = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(categories)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response({
+                'success': True,
+                'message': "All categories fetched successfully",
+                'data': serializer.data
+            })
         serializer = self.get_serializer(categories, many=True)
         return success_response("All categories fetched successfully", serializer.data)
 
     # Retrieve single
     def retrieve(self, request, *args, **kwargs):
+        if connection.vendor == 'postgresql':
+            # Build the nested subcategory list in the same query instead of a second SELECT
+            from django.contrib.postgres.aggregates import JSONBAgg
+
+            try:
+                row = Category.objects.filter(pk=kwargs['pk']).annotate(
+                    subcategory_list=JSONBAgg(
+                        JSONObject(id='subcategories__id', name='subcategories__name'),
+                        filter=Q(subcategories__isnull=False),
+                        ordering='subcategories__id',
+                    )
+                ).values('id', 'name', 'subcategory_list').first()
+            except (ValueError, TypeError):
+                raise Http404
+            if row is None:
+                raise Http404
+            data = {'id': row['id'], 'name': row['name'], 'subcategories': row['subcategory_list'] or []}
+            return success_response("Category fetched successfully", data)
+
         category = self.get_object()
         serializer = self.get_serializer(category)
         return success_response("Category fetched successfully", serializer.data)
@@ -41,8 +81,8 @@ class CategoryViewSet(viewsets.ModelViewSet):
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         if serializer.is_valid():
-            serializer.save()
-            return success_response("Category created successfully", serializer.data, status.HTTP_201_CREATED)
+            category = serializer.save()
+            return success_response("Category created successfully", {'id': category.pk, 'name': category.name}, status.HTTP_201_CREATED)
         return error_response(serializer.errors)
 
     # Update (PUT)
@@ -50,8 +90,8 @@ class CategoryViewSet(viewsets.ModelViewSet):
         category = self.get_object()
         serializer = self.get_serializer(category, data=request.data)
         if serializer.is_valid():
-            serializer.save()
-            return success_response("Category updated successfully", serializer.data)
+            category = serializer.save()
+            return success_response("Category updated successfully", {'id': category.pk, 'name': category.name})
         return error_response(serializer.errors)
 
     # Partial Update (PATCH)
@@ -59,8 +99,8 @@ class CategoryViewSet(viewsets.ModelViewSet):
         category = self.get_object()
         serializer = self.get_serializer(category, data=request.data, partial=True)
         if serializer.is_valid():
-            serializer.save()
-            return success_response("Category partially updated", serializer.data)
+            category = serializer.save()
+            return success_response("Category partially updated", {'id': category.pk, 'name': category.name})
         return error_response(serializer.errors)
 
     # Delete
@@ -71,13 +111,22 @@ class CategoryViewSet(viewsets.ModelViewSet):
 
 class SubCategoryViewSet(viewsets.ModelViewSet):
     """ Viewset for SubCategory """
-    queryset = SubCategory.objects.all()
+    queryset = SubCategory.objects.order_by('id')
     serializer_class = SubCategorySerializer
     permission_classes = [permissions.AllowAny]
+    pagination_class = CategoryPagination
 
     # List all
     def list(self, request, *args, **kwargs):
-        sub_categories = self.get_queryset()
+        sub_categories = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(sub_categories)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response({
+                'success': True,
+                'message': "All sub-categories fetched successfully",
+                'data': serializer.data
+            })
         serializer = self.get_serializer(sub_categories, many=True)
         return success_response("All sub-categories fetched successfully", serializer.data)
 
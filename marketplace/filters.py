@@ -0,0 +1,24 @@
+from datetime import datetime, time, timedelta
+
+import django_filters
+from django.utils import timezone
+
+from .models import Product
+
+
+class ProductFilter(django_filters.FilterSet):
+    """ Product filters; date bounds compare created_at directly so its index can be used """
+    start_date = django_filters.DateFilter(method='filter_start_date')
+    end_date = django_filters.DateFilter(method='filter_end_date')
+
+    class Meta:
+        model = Product
+        fields = ['status', 'condition', 'sub_category', 'sub_category__category']
+
+    def filter_start_date(self, queryset, name, value):
+        return queryset.filter(created_at__gte=timezone.make_aware(datetime.combine(value, time.min)))
+
+    def filter_end_date(self, queryset, name, value):
+        # end_date is inclusive: keep everything before the start of the next day
+        next_day = datetime.combine(value + timedelta(days=1), time.min)
+        return queryset.filter(created_at__lt=timezone.make_aware(next_day))
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.27 on 2026-10-16 15:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('marketplace', '0005_remove_product_color'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['-created_at'], name='marketplace_created_19f3ec_idx'),
+        ),
+    ]
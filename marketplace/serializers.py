@@ -14,6 +14,7 @@ class SubCategorySerializer(serializers.ModelSerializer):
 
 class CategorySerializer(serializers.ModelSerializer):
     subcategories = SubCategorySerializer(many=True, read_only=True)
+    # Populated by the Count('subcategories') annotation in MarketplaceCategoryViewSet.get_queryset
     subcategory_count = serializers.IntegerField(read_only=True)
     class Meta:
         model = Category
@@ -21,9 +22,6 @@ class CategorySerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
         ref_name = 'MarketplaceCategory'
 
-    def get_subcategory_count(self, obj):
-        return obj.subcategories.count()
-
 class ProductSerializer(serializers.ModelSerializer):
     user_name = serializers.CharField(source='user.username', read_only=True)
     category_name = serializers.CharField(source='sub_category.category.name', read_only=True)
@@ -1,3 +1,36 @@
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
 
-# Create your tests here.
+from .models import Category, SubCategory
+from .views import MarketplaceCategoryViewSet
+
+User = get_user_model()
+
+
+class MarketplaceCategoryViewSetTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            username='admin', email='admin@example.com', password='pass1234', is_staff=True
+        )
+        self.factory = APIRequestFactory()
+
+    def call(self, method, action, path, data=None, **kwargs):
+        request = getattr(self.factory, method)(path, data, format='json')
+        force_authenticate(request, user=self.admin)
+        return MarketplaceCategoryViewSet.as_view({method: action})(request, **kwargs)
+
+    def test_subcategory_count_on_every_path(self):
+        created = self.call('post', 'create', '/', {'name': 'Phones'})
+        self.assertEqual(created.status_code, 201)
+        self.assertEqual(created.data['data']['subcategory_count'], 0)
+
+        category = Category.objects.get(pk=created.data['data']['id'])
+        SubCategory.objects.create(category=category, name='Android')
+
+        listed = self.call('get', 'list', '/')
+        self.assertEqual(listed.data['data'][0]['subcategory_count'], 1)
+        retrieved = self.call('get', 'retrieve', '/', pk=category.pk)
+        self.assertEqual(retrieved.data['data']['subcategory_count'], 1)
+        updated = self.call('put', 'update', '/', {'name': 'Mobiles'}, pk=category.pk)
+        self.assertEqual(updated.data['data']['subcategory_count'], 1)
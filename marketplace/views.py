@@ -1,6 +1,7 @@
 from django.shortcuts import render
 from .models import *
 from .serializers import *
+from .filters import ProductFilter
 from accounts.permissions import *
 from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly, AllowAny
 from rest_framework import viewsets
@@ -9,7 +10,7 @@ from rest_framework.response import Response
 from django.contrib.auth import get_user_model
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q
+from django.db.models import Q, Count
 from rest_framework import filters
 from rest_framework.decorators import action
 
@@ -36,12 +37,17 @@ class MarketplaceCategoryViewSet(viewsets.ModelViewSet):
 
     permission_classes = [IsOwnerOrReadOnly]
 
+    def get_queryset(self):
+        return Category.objects.prefetch_related('subcategories').annotate(
+            subcategory_count=Count('subcategories')
+        )
+
     def list(self, request, *args, **kwargs):
         serializer = self.get_serializer(self.get_queryset(), many=True)
         return success_response("Category list retrieved successfully.", serializer.data)
 
     def retrieve(self, request, pk=None, *args, **kwargs):
-        category = get_object_or_404(Category, pk=pk)
+        category = get_object_or_404(self.get_queryset(), pk=pk)
         serializer = self.get_serializer(category)
         return success_response("Category retrieved successfully.", serializer.data)
 
@@ -49,13 +55,15 @@ class MarketplaceCategoryViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(data=request.data)
 
         if serializer.is_valid():
-            serializer.save()
+            category = serializer.save()
+            # A new category has no sub-categories; mirror the list annotation
+            category.subcategory_count = 0
             return success_response("Category created successfully.", serializer.data, status.HTTP_201_CREATED)
 
         return error_response("Category creation failed.", serializer.errors)
 
     def update(self, request, pk=None, *args, **kwargs):
-        category = get_object_or_404(Category, pk=pk)
+        category = get_object_or_404(self.get_queryset(), pk=pk)
         serializer = self.get_serializer(category, data=request.data)
 
         if serializer.is_valid():
@@ -107,7 +115,7 @@ class MarketplaceProductViewSet(viewsets.ModelViewSet):
     queryset = Product.objects.all()
     permission_classes = [IsAuthenticatedOrReadOnly]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
-    filterset_fields = ['status', 'condition', 'sub_category', 'sub_category__category']
+    filterset_class = ProductFilter
     search_fields = ['name', 'description', 'location']
 
     def get_serializer_class(self):
@@ -120,7 +128,14 @@ class MarketplaceProductViewSet(viewsets.ModelViewSet):
         if getattr(self, 'swagger_fake_view', False):
             return Product.objects.none()
         
-        queryset = super().get_queryset()
+        queryset = super().get_queryset().select_related('user', 'sub_category__category')
+        if self.action == 'list':
+            # Only the columns ProductListSerializer renders
+            queryset = queryset.only(
+                'id', 'name', 'image', 'price', 'condition', 'status', 'description',
+                'location', 'link', 'created_at', 'user__username',
+                'sub_category__name', 'sub_category__category__name',
+            )
         user = self.request.user
         
         # Admin → show all
@@ -136,37 +151,17 @@ class MarketplaceProductViewSet(viewsets.ModelViewSet):
         return queryset.filter(Q(status='published') | Q(user=user))
 
     def list(self, request, *args, **kwargs):
-        from datetime import datetime
-        import logging
-        
-        logger = logging.getLogger(__name__)
-        
         queryset = self.filter_queryset(self.get_queryset())
-        
-        # Filter by date range if provided
-        start_date = request.query_params.get('start_date', None)
-        end_date = request.query_params.get('end_date', None)
-        
-        logger.info(f"Product list - start_date: {start_date}, end_date: {end_date}")
-        
-        if start_date:
-            try:
-                date_obj = datetime.strptime(start_date, '%Y-%m-%d').date()
-                queryset = queryset.filter(created_at__date__gte=date_obj)
-                logger.info(f"Applied start_date filter: {date_obj}")
-            except (ValueError, TypeError) as e:
-                logger.error(f"Error parsing start_date '{start_date}': {str(e)}")
-                pass
-        
-        if end_date:
-            try:
-                date_obj = datetime.strptime(end_date, '%Y-%m-%d').date()
-                queryset = queryset.filter(created_at__date__lte=date_obj)
-                logger.info(f"Applied end_date filter: {date_obj}")
-            except (ValueError, TypeError) as e:
-                logger.error(f"Error parsing end_date '{end_date}': {str(e)}")
-                pass
-        
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response({
+                'success': True,
+                'message': "Product list retrieved successfully.",
+                'data': serializer.data
+            })
+
         serializer = self.get_serializer(queryset, many=True)
         return success_response("Product list retrieved successfully.", serializer.data)
 
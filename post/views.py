@@ -14,6 +14,7 @@ from django.core.files.storage import default_storage
 from rest_framework import parsers
 from community.models import *
 from community.serializers import *
+from community.utils import is_community_member
 import random
 from .moderation import moderate_post
 from rest_framework import serializers 
@@ -445,7 +446,7 @@ class PostViewSet(viewsets.ModelViewSet):
         
         # Boost if from joined community
         if post.community:
-            if CommunityMember.objects.filter(user=user, community=post.community, is_approved=True).exists():
+            if is_community_member(user.id, post.community_id):
                 personalization *= 1.5
         
         # Boost if user has interacted with similar content